@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+# BillDetailView.get_related_queryset filters these tables on Lower('bill_number');
+# Django 3.1 cannot declare expression indexes in Meta.indexes, so they are created with SQL
+# that both PostgreSQL and SQLite accept.
+TABLES = ['bills_statement', 'bills_committeedocument', 'bills_cboreport']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bills', '0003_auto_20210831_1602'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=f'CREATE INDEX {table}_bill_number_lower ON {table} (lower(bill_number));',
+            reverse_sql=f'DROP INDEX {table}_bill_number_lower;',
+        )
+        for table in TABLES
+    ]
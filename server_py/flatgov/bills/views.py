@@ -1,13 +1,14 @@
-import json
+import hashlib
 
-from functools import reduce
-from typing import Dict
 from operator import itemgetter
 
 from django.conf import settings
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.db.models.functions import Lower
 from django.shortcuts import render
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 from django.views.generic import TemplateView, DetailView
 from django.views.generic.edit import FormMixin
 
@@ -23,25 +24,11 @@ from bills.serializers import RelatedBillSerializer
 from bills.utils import sort_bills_for_congress
 from common.elastic_load import getSimilarSections, moreLikeThis, getResultBillnumbers
 from common.tasks import send_email
+from common.utils import dumpsJSON, loadsJSON
 from crs.models import CrsReport
 from feedback.forms import FeedbackModelForm
 
 
-def deep_get(dictionary: Dict, *keys):
-    """
-    A Dict utility to get a field; returns None if the field does not exist
-    Args:
-      dictionary (Dict): an arbitrary dictionary
-
-    Returns:
-      any: value of the specified key, or None if the field does not exist
-    """
-
-    return reduce(
-        lambda d, key: d.get(key, None)
-        if isinstance(d, dict) else None, keys, dictionary)
-
-
 CONGRESS_DATA_PATH = getattr(settings, "CONGRESS_DATA_PATH", None)
 BILLS_META_JSON_PATH = getattr(settings, "BILLS_META_JSON_PATH", None)
 RELATED_BILLS_JSON_PATH = getattr(settings, "RELATED_BILLS_JSON_PATH", None)
@@ -51,6 +38,11 @@ IDENTICAL_REASONS = ['identical', 'nearly identical', 'title match (main)']
 
 BILL_REGEX = r'([1-9][0-9]{2})([a-z]+)(\d+)'
 
+# Seconds to keep the results of a similar bills query
+SIMILAR_BILLS_CACHE_TIMEOUT = 3600
+# Seconds to keep the computed context of a bill page
+BILL_CONTEXT_CACHE_TIMEOUT = 86400
+
 
 # Utilities. These should go in a utils.py module
 def billIdToBillNumber(bill_id: str) -> str:
@@ -88,30 +80,48 @@ class BillListView(TemplateView):
         return context
 
 
-def similar_bills_view(request):
-    noResults = False
-    # after the redirect (in the views.py that handles your redirect)
-    queryText = request.session.get('queryText')
-    if not queryText:
-        queryText = ''
+def getSimilarBillsCacheKey(queryText: str) -> str:
+    """
+    Cache key for the results of a similar bills query. The text is normalized (whitespace collapsed,
+    lower case) and hashed, so that the key has a fixed length.
+    """
+    normalizedText = ' '.join(queryText.split()).lower()
+    return 'simbills:' + hashlib.blake2b(normalizedText.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def getSimilarBills(queryText: str):
+    """
+    Runs a more like this query for the text. The sections are sorted and encoded as JSON here,
+    so that a cached result can be rendered without doing either again.
+
+    Returns:
+        tuple: (similarBillNumbers, bestMatch, similarSections as a JSON string sorted by score)
+    """
     res = moreLikeThis(queryText=queryText)
     similarBillNumbers = getResultBillnumbers(res)
+    # The template shows every section, so the full list is sorted
     similarSections = sorted(getSimilarSections(res),
                              key=itemgetter('score'),
                              reverse=True)
-    bestMatch = {}
-    if not similarSections or len(similarSections) == 0:
-        noResults = True
-    else:
-        bestMatch = similarSections[0]
+    bestMatch = similarSections[0] if similarSections else {}
+    return similarBillNumbers, bestMatch, dumpsJSON(similarSections).decode('utf-8')
+
+
+def similar_bills_view(request):
+    # after the redirect (in the views.py that handles your redirect)
+    queryText = request.session.get('queryText')
+    if not queryText:
+        queryText = ''
+    similarBillNumbers, bestMatch, similarSections = cache.get_or_set(
+        getSimilarBillsCacheKey(queryText), lambda: getSimilarBills(queryText), SIMILAR_BILLS_CACHE_TIMEOUT)
 
     context = {
         "billQuery": {
             "queryText": queryText,
             "bestMatch": bestMatch,
             "similarBillNumbers": similarBillNumbers,
-            "similarSections": json.dumps(similarSections),
-            "noResults": noResults
+            "similarSections": similarSections,
+            "noResults": not bestMatch
         }
     }
     return render(request, 'bills/bill-similar.html', context)
@@ -121,7 +131,6 @@ class BillDetailView(FormMixin, DetailView):
     model = Bill
     template_name = 'bills/detail.html'
     slug_field = 'bill_congress_type_number'
-    identical_bill_numbers = []
     form_class = FeedbackModelForm
 
     def get_success_url(self):
@@ -153,21 +162,44 @@ class BillDetailView(FormMixin, DetailView):
         qs = Bill.objects.filter(bill_congress_type_number__in=congress_list)
         return qs
 
+    def get_bill_context_cache_key(self):
+        # `updated` changes whenever the bill is saved, so a saved bill gets a new key
+        updated = self.object.updated.timestamp() if self.object.updated else ''
+        return 'billctx:{}:{}'.format(self.object.bill_congress_type_number, updated)
+
+    def get_bill_context(self):
+        """
+        The part of the context that is computed from the bill's own fields and from related documents.
+        It is cached (see get_context_data). Cosponsor data is left out: the Cosponsor table and
+        Bill.cosponsors change without the bill being saved.
+        """
+        return {
+            'identical_bill_numbers': self.identical_bill_numbers,
+            'committees_dict': self.object.committees_dict,
+            'committees_dict_deduped': self.committees_dict_deduped,
+            'committees_map': self.committees_map,
+            # Evaluate the querysets, so that their results are cached rather than the queries
+            'statements': list(self.get_related_statements()),
+            'committees': list(self.get_related_committees()),
+            'crs_reports': self.get_crs_reports(),
+            'cbo_reports': list(self.get_related_cbo()),
+            'related_bills': self.get_related_bills(),
+            'similar_bills': self.similar_bills,
+            'es_similarity': self.object.es_similarity,
+            'current_bill_score': self.current_bill_score,
+        }
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['identical_bill_numbers'] = self.get_identical_bill_numbers()
+        # Related documents (e.g. statements, CRS reports) can change without the bill being saved;
+        # those changes are shown once the cached context expires
+        bill_context = cache.get_or_set(
+            self.get_bill_context_cache_key(), self.get_bill_context, BILL_CONTEXT_CACHE_TIMEOUT)
+        context.update(bill_context)
+        # Use the cached values for the cosponsor tables, rather than recomputing the similar bills
+        self.identical_bill_numbers = bill_context['identical_bill_numbers']
+        self.committees_map = bill_context['committees_map']
         context['cosponsors_dict'] = self.get_cosponsors_dict()
-        context['committees_dict'] = self.object.committees_dict
-        context['committees_dict_deduped'] = self.get_committees_dict_deduped()
-        context['committees_map'] = self.get_committees_map()
-        context['statements'] = self.get_related_statements()
-        context['committees'] = self.get_related_committees()
-        context['crs_reports'] = self.get_crs_reports()
-        context['cbo_reports'] = self.get_related_cbo()
-        context['related_bills'] = self.get_related_bills()
-        context['similar_bills'] = self.object.get_similar_bills
-        context['es_similarity'] = self.object.es_similarity
-        context['current_bill_score'] = self.get_current_bill_score()
         context['cosponsors_for_bills'] = self.get_cosponsors_for_same_bills()
         context['propublica_api_key'] = settings.PROPUBLICA_CONGRESS_API_KEY
         context['no_data_message'] = "No data available for this table"
@@ -175,33 +207,48 @@ class BillDetailView(FormMixin, DetailView):
 
         return context
 
-    def get_related_statements(self, **kwargs):
+    def get_unique_bill_numbers(self, include_congress=False):
+        """
+        The current bill number followed by the identical bill numbers, without duplicates.
+        With include_congress=False, the congress prefix is removed (e.g. 116hr1 -> hr1).
+        """
+        start = 0 if include_congress else 3
+        bill_numbers = [self.kwargs['slug'][start:]]
+        seen = set(bill_numbers)
+        for number in self.identical_bill_numbers:
+            bill_number = number[start:]
+            if bill_number not in seen:
+                seen.add(bill_number)
+                bill_numbers.append(bill_number)
+        return bill_numbers
+
+    def get_related_queryset(self, model):
+        """
+        Gets the objects of `model` (which has bill_number and congress fields) for the current bill and
+        its identical bills. bill_number is matched case-insensitively with a single IN, rather than
+        an OR of iexact lookups.
+        """
         slug = self.kwargs['slug']
-        bill_numbers = []
-        bill_numbers.append(slug[3:])
-        [bill_numbers.append(number[3:]) for number in self.identical_bill_numbers if number[3:] not in bill_numbers]
-        q_list = map(lambda n: Q(bill_number__iexact=n), bill_numbers)
-        q_list = reduce(lambda a, b: a | b, q_list)
-        return Statement.objects.filter(q_list).filter(
-            congress__iexact=slug[:3])
+        bill_numbers = [bill_number.lower() for bill_number in self.get_unique_bill_numbers()]
+        return model.objects.annotate(bill_number_lower=Lower('bill_number')).filter(
+            bill_number_lower__in=bill_numbers, congress__iexact=slug[:3])
+
+    def get_related_statements(self, **kwargs):
+        return self.get_related_queryset(Statement)
 
     def get_related_committees(self, **kwargs):
-        slug = self.kwargs['slug']
-        bill_numbers = []
-        bill_numbers.append(slug[3:])
-        [bill_numbers.append(number[3:]) for number in self.identical_bill_numbers if number[3:] not in bill_numbers]
-        q_list = map(lambda n: Q(bill_number__iexact=n), bill_numbers)
-        q_list = reduce(lambda a, b: a | b, q_list)
-        return CommitteeDocument.objects.filter(q_list).filter(congress__iexact=slug[:3])
+        return self.get_related_queryset(CommitteeDocument)
 
     def get_crs_reports(self, **kwargs):
-        slug = self.kwargs['slug']
-        bill_numbers = []
-        bill_numbers.append(slug)
-        [bill_numbers.append(number) for number in self.identical_bill_numbers if number[3:] not in bill_numbers]
-        q_list = map(lambda n: Q(bills__bill_congress_type_number__iexact=n), bill_numbers)
-        q_list = reduce(lambda a, b: a | b, q_list)
-        crs_reports = list(CrsReport.objects.filter(q_list).distinct('title'))
+        bill_numbers = self.get_unique_bill_numbers(include_congress=True)
+        # bill_congress_type_number is stored in lower case, so a plain IN (which can use its index) is enough.
+        # The bill numbers of all reports are prefetched in one query; only the bill number is used
+        # The raw report text is not shown, so it is not loaded
+        crs_reports = list(CrsReport.objects.filter(
+            bills__bill_congress_type_number__in=bill_numbers).distinct('title').defer(
+            'report_content_raw').prefetch_related(
+            Prefetch('bills', queryset=Bill.objects.only('id', 'bill_congress_type_number'))))
+        bill_numbers_set = set(bill_numbers)
 
         crs_reports_context = []
         for report in crs_reports:
@@ -215,8 +262,8 @@ class BillDetailView(FormMixin, DetailView):
                     main_everycrs = "https://www.everycrsreport.com/reports/" + fileparts[1] + ".html"
             if report.html_url:
                 html_everycrs = "https://www.everycrsreport.com/files/" + report.html_url
-            crs_bill_numbers = report.bills.all().values_list('bill_congress_type_number', flat=True)
-            identical_bill_number = list(set(bill_numbers).intersection(crs_bill_numbers))
+            crs_bill_numbers = [bill.bill_congress_type_number for bill in report.bills.all()]
+            identical_bill_number = list(bill_numbers_set.intersection(crs_bill_numbers))
 
             context_item = {
                 "title": report.title,
@@ -227,7 +274,8 @@ class BillDetailView(FormMixin, DetailView):
                 "html_everycrs": html_everycrs,
                 "pdf_everycrs": pdf_everycrs
             }
-            metadata = json.loads(report.metadata)
+            # metadata is stored as a JSON string
+            metadata = loadsJSON(report.metadata) if report.metadata else {}
             versions = metadata.get('versions', [])
             if versions and len(versions) > 0:
                 context_item["link"] = versions[0].get('sourceLink', '')
@@ -235,14 +283,7 @@ class BillDetailView(FormMixin, DetailView):
         return crs_reports_context
 
     def get_related_cbo(self, **kwargs):
-        slug = self.kwargs['slug']
-        bill_numbers = []
-        bill_numbers.append(slug[3:])
-        [bill_numbers.append(number[3:]) for number in self.identical_bill_numbers if number[3:] not in bill_numbers]
-        q_list = map(lambda n: Q(bill_number__iexact=n), bill_numbers)
-        q_list = reduce(lambda a, b: a | b, q_list)
-        return CboReport.objects.filter(q_list).filter(
-            congress__iexact=slug[:3])
+        return self.get_related_queryset(CboReport)
 
     def get_related_bills(self):
         qs = self.get_qs_related_bill()
@@ -251,24 +292,27 @@ class BillDetailView(FormMixin, DetailView):
                                            context={'bill': self.object})
         return serializer.data
 
-    def get_committees_dict_deduped(self, **kwargs):
+    # The view is instantiated per request, so the cached properties below are computed once per request
+    @cached_property
+    def committees_dict_deduped(self):
         committees_dict = self.object.committees_dict
         if not committees_dict:
             return []
         deduped = []
         # list of committees
-        seen = []
+        seen = set()
         for committeeItem in committees_dict:
             k = committeeItem.get('committee', '')
             if not k or k in seen:
                 continue
 
-            seen.append(k)
+            seen.add(k)
             deduped.append(committeeItem)
         return deduped
 
-    def get_committees_map(self, **kwargs):
-        deduped = self.get_committees_dict_deduped()
+    @cached_property
+    def committees_map(self):
+        deduped = self.committees_dict_deduped
         return {
             committee.get('committee_id'): committee.get('committee')
             for committee in deduped
@@ -293,6 +337,11 @@ class BillDetailView(FormMixin, DetailView):
             else:
                 cosponsors.insert(0, sponsor)
         # Add party from Cosponsors table
+        # Fetch all of the Cosponsor rows at once, rather than one query per cosponsor
+        bioguide_ids = [cosponsor.get('bioguide_id') for cosponsor in cosponsors if cosponsor.get('bioguide_id')]
+        cosponsor_items = {}
+        for cosponsor_item in Cosponsor.objects.filter(bioguide_id__in=bioguide_ids):
+            cosponsor_items.setdefault(cosponsor_item.bioguide_id, []).append(cosponsor_item)
         unoriginal_cosponsors = []
         sorted_unoriginal_ranked_cosponsors = []
         unoriginal_unranked_cosponsors = []
@@ -303,16 +352,13 @@ class BillDetailView(FormMixin, DetailView):
             bioguide_id = cosponsor.get("bioguide_id", "")
             committee_id = cosponsor.get('committee_id')
             if bioguide_id:
-                try:
-                    cosponsor_item = Cosponsor.objects.get(bioguide_id=bioguide_id)
-                    if cosponsor_item:
-                        cosponsor["current"] = True
-                    else:
-                        cosponsor["current"] = False
-
-                except Exception:
+                # As with Cosponsor.objects.get, a missing or duplicated bioguide_id is not current
+                matching_items = cosponsor_items.get(bioguide_id, [])
+                if len(matching_items) != 1:
                     cosponsor["current"] = False
                     continue
+                cosponsor_item = matching_items[0]
+                cosponsor["current"] = True
                 cosponsor['party'] = cosponsor_item.party
                 cosponsor['name_full_official'] = cosponsor_item.name_full_official
                 for committee in cosponsor_item.committees:
@@ -349,44 +395,48 @@ class BillDetailView(FormMixin, DetailView):
         return cosponsors[
                :1] + sorted_original_ranked_cosponsors + original_unranked_cosponsors + sorted_unoriginal_ranked_cosponsors + unoriginal_unranked_cosponsors
 
-    def get_billnumbers_similar(self):
-        return [bill.get('bill_congress_type_number', '')
-                for bill in self.object.get_similar_bills]
-
-    def get_current_bill_score(self):
-        if self.object.bill_congress_type_number in self.get_billnumbers_similar():
-            current_bill = next(
-                filter(
-                    lambda bill: bill.get('bill_congress_type_number') == self.
-                        object.bill_congress_type_number,
-                    self.object.get_similar_bills))
-            current_bill_score = current_bill.get('score')
-        else:
-            current_bill_score = 0
-        return current_bill_score
+    @cached_property
+    def similar_bills(self):
+        # Bill.get_similar_bills is recomputed (with queries) on every access
+        return self.object.get_similar_bills
+
+    @cached_property
+    def similar_bills_by_number(self):
+        similar_bills_by_number = {}
+        for bill in self.similar_bills:
+            similar_bills_by_number.setdefault(bill.get('bill_congress_type_number', ''), bill)
+        return similar_bills_by_number
+
+    @cached_property
+    def current_bill_score(self):
+        current_bill = self.similar_bills_by_number.get(self.object.bill_congress_type_number)
+        if current_bill:
+            return current_bill.get('score')
+        return 0
 
     #  Get identical or nearly identical bills with the following, or equivalent
-    def get_identical_bill_numbers(self):
-        current_bill_score = self.get_current_bill_score()
+    @cached_property
+    def identical_bill_numbers(self):
+        current_bill_score = self.current_bill_score
 
         identical_bill_numbers = [billnumber for billnumber in [bill.get('bill_congress_type_number', '')
-            for bill in self.object.get_similar_bills
+            for bill in self.similar_bills
             if (any(x in cleanReasons(bill.get('reason').split(", ")) for x in IDENTICAL_REASONS)
             or (current_bill_score > 0 and (abs(bill.get('score') - current_bill_score) / current_bill_score < SIMILARITY_THRESHOLD)))]
             if billnumber]
-        self.identical_bill_numbers = identical_bill_numbers
         sort_bills_for_congress(identical_bill_numbers)
         return identical_bill_numbers
 
     # SIMILARITY_THRESHOLD: Fraction difference in score that will still be considered identical
     def get_cosponsors_for_same_bills(self):
-        committees_map = self.get_committees_map()
+        committees_map = self.committees_map
         billnumbers = self.identical_bill_numbers
         if self.object.bill_congress_type_number not in billnumbers:
             billnumbers = [self.object.bill_congress_type_number, *billnumbers]
-        billids = [Bill.objects.get(
-            bill_congress_type_number=billnumber).id for billnumber in billnumbers]
-        bill_dict = {billid: billnumbers[i] for i, billid in enumerate(billids)}
+        bills_qs = Bill.objects.filter(
+            bill_congress_type_number__in=billnumbers).values('id', 'bill_congress_type_number')
+        bill_dict = {bill['id']: bill['bill_congress_type_number'] for bill in bills_qs}
+        billids = list(bill_dict.keys())
         cosponsors_for_bills = Cosponsor.objects.filter(
             bill__in=billids).values("bioguide_id", "name_full_official",
                                      "party", "state", "leadership",
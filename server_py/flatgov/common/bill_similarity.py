@@ -652,7 +652,8 @@ def processBill(bill_path: str = PATH_BILL):
 
         try:
             print('Saving bill: {0}'.format(billnumber))
-            bill.save(update_fields=['related_dict', 'es_similarity', 'es_similar_bills_dict'])
+            # `updated` is not set by auto_now when update_fields is given; it keys the bill page cache
+            bill.save(update_fields=['related_dict', 'es_similarity', 'es_similar_bills_dict', 'updated'])
         except Exception as err:
             print('Could not save similarity: {0}'.format(str(err)))
             raise err
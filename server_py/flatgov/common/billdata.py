@@ -2,18 +2,28 @@
 #
 # Command line template from
 # https://gist.githubusercontent.com/opie4624/3896526/raw/3aff2ad7030a74ce26f9fcf80791ae0396d84f18/commandline.py
-import gzip
+import datetime
+import hashlib
 import json
 import logging
+import multiprocessing
 import os
 import re
 import sys
+import threading
 
-from typing import Dict
-from functools import reduce
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from functools import partial
 
 from bills.models import Bill
 from common import constants, utils
+from common.utils import deep_get, dumpsJSON, igzip, loadGzipJSON, loadsJSON
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 
 logging.basicConfig(filename='billdata.log', filemode='w', level='INFO')
@@ -61,8 +71,9 @@ def getTopBillLevel(dirName: str):
     Returns:
         [bool]: True if path is a top level (which will contain data.json); False otherwise
     """
-    dirName_parts = dirName.split('/')
-    return re.match(r'[a-z]+[0-9]+', dirName_parts[-1]) is not None and dirName_parts[-3] == 'bills'
+    dirName_parts = dirName.rsplit('/', 3)
+    return (len(dirName_parts) >= 3 and dirName_parts[-3] == 'bills'
+            and constants.BILL_TOPLEVEL_DIR_REGEX_COMPILED.fullmatch(dirName_parts[-1]) is not None)
 
 
 def isDataJson(fileName: str) -> bool:
@@ -81,6 +92,59 @@ def walkBillDirs(
                 processFile(dirName=dirName, fileName=fname)
 
 
+def scanDir(dirName: str, dirMatch=getTopBillLevel, fileMatch=isDataJson):
+    """
+    Lists a single directory with os.scandir, which reuses the file type from the directory
+    listing instead of calling stat on every entry.
+
+    Args:
+        dirName (str): directory to list
+        dirMatch (function): selects the directories whose files are matched
+        fileMatch (function): selects the files to return
+
+    Returns:
+        tuple: (list of matching file paths, list of subdirectory paths)
+    """
+    filePaths = []
+    subDirs = []
+    isMatch = dirMatch(dirName)
+    if isMatch:
+        logger.info('Entering directory: %s' % dirName)
+    with os.scandir(dirName) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subDirs.append(entry.path)
+            elif isMatch and fileMatch(entry.name):
+                filePaths.append(entry.path)
+    return filePaths, subDirs
+
+
+def scanBillFiles(
+        rootDir=constants.PATH_TO_CONGRESSDATA_DIR, dirMatch=getTopBillLevel, fileMatch=isDataJson
+) -> Iterator[str]:
+    """
+    Yields the paths of matching files under rootDir, like walkBillDirs. Each level of the tree is
+    listed concurrently in a thread pool, so that many directory reads are outstanding at once.
+
+    Args:
+        rootDir (str): directory to walk
+        dirMatch (function): selects the directories whose files are matched
+        fileMatch (function): selects the files to yield
+
+    Yields:
+        str: path to a matching file
+    """
+    scan = partial(scanDir, dirMatch=dirMatch, fileMatch=fileMatch)
+    with ThreadPoolExecutor(max_workers=constants.SCAN_WORKERS) as executor:
+        dirNames = [rootDir]
+        while dirNames:
+            nextDirNames = []
+            for filePaths, subDirs in executor.map(scan, dirNames):
+                yield from filePaths
+                nextDirNames.extend(subDirs)
+            dirNames = nextDirNames
+
+
 # Utilities. These should go in a utils.py module
 def billIdToBillNumber(bill_id: str) -> str:
     """
@@ -97,29 +161,63 @@ def billIdToBillNumber(bill_id: str) -> str:
     return ''.join(reversed(bill_id.split('-')))
 
 
-def deep_get(dictionary: Dict, *keys):
+def loadJSON(filePath: str):
+    with open(filePath, 'rb') as f:
+        fileDict = loadsJSON(f.read())
+    return fileDict
+
+
+# Fields of data.json used by makeBillMeta; other fields are not decoded by loadBillDataJSON
+BILL_DATA_FIELDS = ['bill_id', 'bill_type', 'committees', 'related_bills']
+BILL_DATA_TITLE_FIELDS = ['title', 'as', 'is_for_portion']
+BILL_DATA_COSPONSOR_FIELDS = ['name', 'bioguide_id']
+
+# The parser reuses its internal buffers from one document to the next, so one is kept per process
+simdjsonParser = None
+
+
+def toPython(value):
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    return value
+
+
+def loadBillDataJSON(filePath: str) -> Dict:
     """
-    A Dict utility to get a field; returns None if the field does not exist
+    Loads the fields of a bill data.json that are used by makeBillMeta. With pysimdjson installed,
+    the document is parsed lazily and only these fields are converted to Python objects; otherwise,
+    the whole file is decoded with loadJSON.
 
     Args:
-        dictionary (Dict): an arbitrary dictionary
+        filePath (str): path to the data.json of a bill
 
     Returns:
-        any: value of the specified key, or None if the field does not exist
+        Dict: the data.json fields in BILL_DATA_FIELDS, 'titles' and 'cosponsors'
     """
+    if simdjson is None:
+        return loadJSON(filePath)
 
-    return reduce(
-        lambda d, key: d.get(key, None) if isinstance(d, dict) else None, keys,
-        dictionary)
-
-
-def loadJSON(filePath: str):
+    global simdjsonParser
+    if simdjsonParser is None:
+        simdjsonParser = simdjson.Parser()
     with open(filePath, 'rb') as f:
-        fileDict = json.load(f)
-    return fileDict
+        doc = simdjsonParser.parse(f.read())
+
+    billDict = {field: toPython(doc[field]) for field in BILL_DATA_FIELDS if field in doc}
+    if 'titles' in doc:
+        billDict['titles'] = [{field: title.get(field) for field in BILL_DATA_TITLE_FIELDS}
+                              for title in doc['titles']]
+    if 'cosponsors' in doc:
+        billDict['cosponsors'] = [{field: cosponsor.get(field) for field in BILL_DATA_COSPONSOR_FIELDS}
+                                  for cosponsor in doc['cosponsors']]
+    # The parser can only be reused once no proxies into the document remain
+    del doc
+    return billDict
 
 
-def getBillCongressTypeNumber(fileDict: Dict):
+def getBillCongressTypeNumber(fileDict: Dict) -> str:
     bill_id = fileDict.get('bill_id')
     if bill_id:
         return billIdToBillNumber(bill_id)
@@ -127,7 +225,7 @@ def getBillCongressTypeNumber(fileDict: Dict):
         raise Exception('No bill_id: ' + str(fileDict.get('bill_type')))
 
 
-def getCosponsors(fileDict: Dict, includeFields=[]) -> list:
+def getCosponsors(fileDict: Dict, includeFields: List[str] = []) -> List[Dict]:
     """
     Gets Cosponsors from data.json Dict. `includeFields` is a list of keys to keep.
     The most useful are probably 'name' and 'bioguide_id'.
@@ -143,7 +241,7 @@ def getCosponsors(fileDict: Dict, includeFields=[]) -> list:
     cosponsors = fileDict.get('cosponsors', [])
 
     if includeFields:
-        cosponsors = list(map(lambda cosponsor: {field: cosponsor.get(field) for field in includeFields}, cosponsors))
+        cosponsors = [{field: cosponsor.get(field) for field in includeFields} for cosponsor in cosponsors]
 
     # for sponsor in cosponsors:
     #   if not sponsor.get('bioguide_id'):
@@ -152,7 +250,7 @@ def getCosponsors(fileDict: Dict, includeFields=[]) -> list:
     return cosponsors
 
 
-def getBillTitles(fileDict: Dict, include_partial=True, billType='all') -> list:
+def getBillTitles(fileDict: Dict, include_partial: bool = True, billType: str = 'all') -> List[Dict]:
     """
     Get a list of bill titles. If include_partial = True (default), gets all titles.
     Otherwise, gets only titles that correspond to the whole bill.
@@ -167,12 +265,13 @@ def getBillTitles(fileDict: Dict, include_partial=True, billType='all') -> list:
         list: a list of titles for the bill; either all titles or only whole-bill titles
     """
     titles = fileDict.get('titles', [])
-    if not include_partial:
-        titles = [title for title in titles if not title.get('is_for_portion')]
-
-    if (billType != 'all') and constants.BILL_TYPES.get(billType):
-        titles = [title for title in titles if constants.BILL_TYPES.get(billType) == title.get('as')]
-    return titles
+    titleAs = constants.BILL_TYPES.get(billType) if billType != 'all' else None
+    if include_partial and not titleAs:
+        return titles
+    # Apply both filters in a single pass
+    return [title for title in titles
+            if (include_partial or not title.get('is_for_portion'))
+            and (not titleAs or title.get('as') == titleAs)]
 
 
 def testWalkDirs():
@@ -208,14 +307,13 @@ def loadBillsMeta(billMetaPath=constants.PATH_TO_BILLS_META, zip=True):
     billsMeta = {}
     if zip:
         try:
-            with gzip.open(billMetaPath + '.gz', 'rt', encoding='utf-8') as zipfile:
-                billsMeta = json.load(zipfile)
+            billsMeta = loadGzipJSON(billMetaPath + '.gz')
         except:
             raise Exception('No file at {0}.gz'.format(billMetaPath))
     else:
         try:
-            with open(billMetaPath, 'r') as f:
-                billsMeta = json.load(f)
+            with open(billMetaPath, 'rb') as f:
+                billsMeta = loadsJSON(f.read())
         except:
             raise Exception('No file at {0}.gz'.format(billMetaPath))
 
@@ -223,11 +321,161 @@ def loadBillsMeta(billMetaPath=constants.PATH_TO_BILLS_META, zip=True):
 
 
 def saveBillsMeta(billsMeta: Dict, metaPath=constants.PATH_TO_BILLS_META, zip=False):
-    with open(metaPath, 'w') as f:
-        json.dump(billsMeta, f)
-        if zip:
-            with gzip.open(metaPath + '.gz', 'wt', encoding="utf-8") as zipfile:
-                json.dump(billsMeta, zipfile)
+    # Encode once; the plain and compressed files are both written from this buffer
+    buf = dumpsJSON(billsMeta)
+    with open(metaPath, 'wb') as f:
+        f.write(buf)
+    if zip:
+        with igzip.open(metaPath + '.gz', 'wb') as zipfile:
+            zipfile.write(buf)
+
+
+# billsMeta fields that are also saved to a file of their own, keyed by billCongressTypeNumber.
+# Only fields that are read with loadBillsMetaField are listed; add a field here when it gets a reader.
+BILLS_META_FIELDS = ['titles']
+
+
+def getBillsMetaFieldPath(field: str, metaPath=constants.PATH_TO_BILLS_META) -> str:
+    """
+    Path of the file for a single billsMeta field, e.g. billsMeta_titles.json.gz for billsMeta.json
+    """
+    return os.path.splitext(metaPath)[0] + '_' + field + '.json.gz'
+
+
+def saveBillsMetaFields(billsMeta: Dict, metaPath=constants.PATH_TO_BILLS_META):
+    """
+    Saves each field in BILLS_META_FIELDS to its own gzipped file, of the form
+    {billCongressTypeNumber: value}, so that a caller that needs one field does not have to load
+    the others.
+
+    Args:
+        billsMeta (Dict): billsMeta, as created by updateBillsMeta
+        metaPath (str): path of billsMeta.json; the field files are saved next to it
+    """
+    for field in BILLS_META_FIELDS:
+        fieldMeta = {billnumber: billMeta.get(field) for billnumber, billMeta in billsMeta.items()}
+        with igzip.open(getBillsMetaFieldPath(field, metaPath), 'wb') as zipfile:
+            zipfile.write(dumpsJSON(fieldMeta))
+
+
+def loadBillsMetaField(field: str, metaPath=constants.PATH_TO_BILLS_META) -> Dict:
+    """
+    Loads a single field of billsMeta, of the form {billCongressTypeNumber: value}.
+    If there is no file for the field, or it is older than billsMeta.json.gz (e.g. billsMeta was
+    created by the Go billmeta command), the field is taken from the full billsMeta.
+
+    Args:
+        field (str): a billsMeta field; fields not in BILLS_META_FIELDS are taken from the full billsMeta
+        metaPath (str): path of billsMeta.json
+
+    Returns:
+        Dict: the value of the field for each bill
+    """
+    fieldPath = getBillsMetaFieldPath(field, metaPath)
+    zipPath = metaPath + '.gz'
+    if os.path.isfile(fieldPath) and (
+            not os.path.isfile(zipPath) or os.path.getmtime(fieldPath) >= os.path.getmtime(zipPath)):
+        return loadGzipJSON(fieldPath)
+    billsMeta = loadBillsMeta(billMetaPath=metaPath)
+    return {billnumber: billMeta.get(field) for billnumber, billMeta in billsMeta.items()}
+
+
+def getBillsMetaCheckpointPath(rootDir=constants.PATH_TO_CONGRESSDATA_DIR,
+                               metaPath=constants.PATH_TO_BILLS_META) -> str:
+    """
+    Path of the checkpoint of an updateBillsMeta run over rootDir, e.g. billsMeta_<hash of rootDir>.jsonl,
+    so that a run over one directory does not resume from a run over another
+    """
+    rootDirHash = hashlib.blake2b(os.path.abspath(rootDir).encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.splitext(metaPath)[0] + '_' + rootDirHash + '.jsonl'
+
+
+class BillsMetaCheckpoint:
+    """
+    Appends new billsMeta entries to a newline-delimited JSON file (one {billCongressTypeNumber: billMeta}
+    per line) from a background thread, once SAVE_ON_COUNT entries are pending. Only entries added since
+    the last flush are written, instead of re-saving the whole of billsMeta. With resume=True the file is
+    appended to, so that a run resumed from the checkpoint (see updateBillsMeta) keeps the entries already
+    saved; otherwise it is truncated.
+
+    Use as a context manager; remaining entries are flushed on exit. If the writer thread fails,
+    its exception is raised from the next add() or on exit.
+    """
+
+    def __init__(self, checkpointPath: str, flushCount=constants.SAVE_ON_COUNT, resume=False):
+        self.checkpointPath = checkpointPath
+        self.resume = resume
+        self.flushCount = flushCount
+        self.pending = {}
+        self.closed = False
+        self.error = None
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.file = open(self.checkpointPath, 'ab' if self.resume else 'wb')
+        # Terminate a line left incomplete by an interrupted run, so that new entries start on their own line
+        if self.file.tell() > 0:
+            with open(self.checkpointPath, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    self.file.write(b'\n')
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+        self.file.close()
+        # Do not replace an exception that is already being raised
+        if self.error is not None and exc[0] is None:
+            raise RuntimeError('Could not save to ' + self.checkpointPath) from self.error
+
+    def add(self, billCongressTypeNumber: str, billMeta: Dict):
+        with self.condition:
+            if self.error is not None:
+                raise RuntimeError('Could not save to ' + self.checkpointPath) from self.error
+            self.pending[billCongressTypeNumber] = billMeta
+            if len(self.pending) >= self.flushCount:
+                self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.closed or len(self.pending) >= self.flushCount)
+                batch, self.pending = self.pending, {}
+                closed = self.closed
+            if batch:
+                try:
+                    self.file.write(b''.join(dumpsJSON({key: value}) + b'\n' for key, value in batch.items()))
+                    self.file.flush()
+                except Exception as err:
+                    logger.error('Could not save to %s: %s' % (self.checkpointPath, err))
+                    with self.condition:
+                        self.error = err
+                    return
+                logger.info('Saved %d bills to %s' % (len(batch), self.checkpointPath))
+            if closed:
+                return
+
+
+def loadBillsMetaCheckpoint(checkpointPath: str) -> Dict:
+    """
+    Loads the billsMeta entries saved by BillsMetaCheckpoint, e.g. after an interrupted updateBillsMeta.
+    A line that cannot be decoded (the last line, if the run stopped while writing it) is skipped.
+    """
+    billsMeta = {}
+    with open(checkpointPath, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                billsMeta.update(loadsJSON(line))
+            except ValueError as err:
+                logger.warning('Skipping incomplete line in %s: %s' % (checkpointPath, err))
+    return billsMeta
 
 
 # fields to be loaded from metadata
@@ -291,62 +539,103 @@ def saveBillsMetaToDb():
             continue
 
 
+def makeBillMeta(filePath: str) -> Optional[Tuple[str, Dict]]:
+    """
+    Creates the billsMeta entry for a bill from its data.json. This does not modify any shared state,
+    so that it can be run in a worker process.
+
+    Args:
+        filePath (str): path to the data.json of a bill
+
+    Returns:
+        tuple: (billCongressTypeNumber, billMeta), or None if the bill number could not be determined
+    """
+    billDict = loadBillDataJSON(filePath)
+    try:
+        billCongressTypeNumber = getBillCongressTypeNumber(billDict)
+        logger.debug('billCongressTypeNumber: ' + billCongressTypeNumber)
+        if not billCongressTypeNumber:
+            logger.warning('!!!!! NO BILL NUMBER !!!!!!')
+            return None
+    except Exception as err:
+        logger.error(err)
+        return None
+    titles = []
+    titlesWholeBill = []
+    for title in getBillTitles(billDict):
+        titleText = title.get('title')
+        titles.append(titleText)
+        if not title.get('is_for_portion'):
+            titlesWholeBill.append(titleText)
+
+    # TODO convert bill_id to billnumber
+    relatedBills = billDict.get('related_bills')
+    for item in relatedBills:
+        bill_id = item.get('bill_id')
+        if bill_id:
+            item['billCongressTypeNumber'] = billIdToBillNumber(bill_id)
+        else:
+            item['billCongressTypeNumber'] = None
+
+    billMeta = {
+        'titles': titles,
+        'titles_whole_bill': titlesWholeBill,
+        'cosponsors': getCosponsors(fileDict=billDict, includeFields=['name', 'bioguide_id']),
+        'committees': billDict.get('committees', []),
+        'related_bills': relatedBills,
+    }
+    utils.dumpRelatedBillJSON(billCongressTypeNumber, billMeta)
+    return billCongressTypeNumber, billMeta
+
+
 # With db = True, this updates fields of the Bill item in the db
-def updateBillsMeta(billsMeta={}):
-    def addToBillsMeta(dirName: str, fileName: str):
-        billDict = loadJSON(os.path.join(dirName, fileName))
-        try:
-            billCongressTypeNumber = getBillCongressTypeNumber(billDict)
-            logger.debug('billCongressTypeNumber: ' + billCongressTypeNumber)
-            if not billCongressTypeNumber:
-                logger.warning('!!!!! NO BILL NUMBER !!!!!!')
-                return
-        except Exception as err:
-            logger.error(err)
-            return
-        if not billsMeta.get(billCongressTypeNumber):
-            billsMeta[billCongressTypeNumber] = {}
-        titles = getBillTitles(billDict)
-        billsMeta[billCongressTypeNumber]['titles'] = [title.get('title') for title in titles]
-        billsMeta[billCongressTypeNumber]['titles_whole_bill'] = [title.get('title') for title in titles if
-                                                                  not title.get('is_for_portion')]
-        cosponsors = getCosponsors(fileDict=billDict, includeFields=['name', 'bioguide_id'])
-        committees = billDict.get('committees', [])
-        billsMeta[billCongressTypeNumber]['cosponsors'] = cosponsors
-        billsMeta[billCongressTypeNumber]['committees'] = committees
-
-        # TODO convert bill_id to billnumber
-        billsMeta[billCongressTypeNumber]['related_bills'] = billDict.get('related_bills')
-        for item in billsMeta[billCongressTypeNumber]['related_bills']:
-            bill_id = item.get('bill_id')
-            if bill_id:
-                item['billCongressTypeNumber'] = billIdToBillNumber(bill_id)
-            else:
-                item['billCongressTypeNumber'] = None
-        billCount = len(billsMeta.keys())
-
-        utils.dumpRelatedBillJSON(billCongressTypeNumber, billsMeta[billCongressTypeNumber])
-        if billCount % constants.SAVE_ON_COUNT == 0:
-            saveBillsMeta(billsMeta)
-
-        # Create Bill object
-        # bill_data = {
-        #   'title': [title.get('title') for title in titles],
-        #   'titles_whole_bill': [title.get('title') for title in titles if not title.get('is_for_portion')],
-        #   'bill_congress_type_number': billCongressTypeNumber,
-        # }
-        # bill, created = Bill.objects.get_or_create(
-        #   bill_congress_type_number=billCongressTypeNumber,
-        #   defaults=bill_data
-        # )
-
-        # sponsor_ids = [sponsor['bioguide_id'] for sponsor in cosponsors if sponsor.get('bioguide_id')]
-        # qs_sponsor = Sponsor.objects.filter(bioguide_id__in=sponsor_ids)
-        # bill.cosponsors.add(*qs_sponsor)
-
-    walkBillDirs(processFile=addToBillsMeta)
-    # walkBillDirs(processFile=logName)
+def updateBillsMeta(billsMeta={}, rootDir=constants.PATH_TO_CONGRESSDATA_DIR, resume=False):
+    """
+    Parses every bill data.json under rootDir in a process pool and collects the results in billsMeta.
+    billsMeta is only modified in this (parent) process. Paths are submitted to the pool as they are
+    found, so that the directory scan overlaps with reading and parsing.
+
+    With resume=True, the checkpoint of an interrupted run over the same rootDir is loaded, and its bills
+    are not parsed again unless their data.json has changed since the checkpoint was last written.
+    Otherwise, a leftover checkpoint is discarded.
+    """
+    filePaths = scanBillFiles(rootDir=rootDir)
+    checkpointPath = getBillsMetaCheckpointPath(rootDir=rootDir)
+    resume = resume and os.path.isfile(checkpointPath)
+    if resume:
+        # Taken before the checkpoint is appended to by this run
+        checkpointTime = os.path.getmtime(checkpointPath)
+        resumedBillsMeta = loadBillsMetaCheckpoint(checkpointPath)
+        logger.warning('Resuming from %s, last written %s, with %d bills' % (
+            checkpointPath, datetime.datetime.fromtimestamp(checkpointTime).isoformat(), len(resumedBillsMeta)))
+        for billCongressTypeNumber, billMeta in resumedBillsMeta.items():
+            if not billsMeta.get(billCongressTypeNumber):
+                billsMeta[billCongressTypeNumber] = {}
+            billsMeta[billCongressTypeNumber].update(billMeta)
+        filePaths = (filePath for filePath in filePaths
+                     if getBillFromDirname(os.path.dirname(filePath)) not in resumedBillsMeta
+                     or os.path.getmtime(filePath) >= checkpointTime)
+    elif os.path.isfile(checkpointPath):
+        logger.warning('Discarding the checkpoint of an earlier run: %s' % checkpointPath)
+    # The workers rely on fork to inherit the Django setup of this process, so the fork context is
+    # requested explicitly. multiprocessing.Pool starts all of its workers in its constructor (unlike
+    # ProcessPoolExecutor, which may start them on demand), so they are forked before the checkpoint
+    # writer and the scan thread pool start, and not from a multi-threaded process.
+    with multiprocessing.get_context('fork').Pool(os.cpu_count()) as pool:
+        with BillsMetaCheckpoint(checkpointPath, resume=resume) as checkpoint:
+            for result in pool.imap(makeBillMeta, filePaths, chunksize=constants.PARSE_CHUNKSIZE):
+                if not result:
+                    continue
+                billCongressTypeNumber, billMeta = result
+                if not billsMeta.get(billCongressTypeNumber):
+                    billsMeta[billCongressTypeNumber] = {}
+                billsMeta[billCongressTypeNumber].update(billMeta)
+                checkpoint.add(billCongressTypeNumber, billMeta)
+
     saveBillsMeta(billsMeta)
+    saveBillsMetaFields(billsMeta)
+    # The full billsMeta has been saved; the checkpoint is no longer needed
+    os.remove(checkpointPath)
     return billsMeta
 
 
@@ -475,7 +764,7 @@ def addFieldToDb(fileName: str, fieldName: str, rootDir=constants.PATH_TO_CONGRE
             if not fieldJSON:
                 return
             setattr(bill, fieldName, fieldJSON)
-            bill.save(update_fields=[fieldName])
+            bill.save(update_fields=[fieldName, 'updated'])
         except Exception as err:
             print(err)
             logger.error(err)
@@ -46,12 +46,19 @@ PATH_TO_NOYEAR_TITLES_INDEX = settings.PATH_TO_NOYEAR_TITLES_INDEX
 PATH_TO_RELATEDBILLS_DIR = settings.PATH_TO_RELATEDBILLS_DIR
 # PATH_TO_RELATEDBILLS = '../relatedBills.json'
 SAVE_ON_COUNT = 1000
+# Number of data.json files sent to each worker process at a time
+PARSE_CHUNKSIZE = 64
+# Number of directories listed concurrently when scanning the congress data tree
+SCAN_WORKERS = 64
 
 BILL_ID_REGEX = r'[a-z]+[1-9][0-9]*-[1-9][0-9]+'
 BILL_NUMBER_REGEX = r'(?P<congress>[1-9][0-9]*)(?P<stage>[a-z]+)(?P<number>[0-9]+)(?P<version>[a-z]+)?$'
 BILL_DIR_REGEX = r'.*?([1-9][0-9]*)\/bills\/[a-z]+\/([a-z]+)([0-9]+)$'
 BILL_NUMBER_REGEX_COMPILED = re.compile(BILL_NUMBER_REGEX)
 BILL_DIR_REGEX_COMPILED = re.compile(BILL_DIR_REGEX)
+# Last path component of a bill's top level directory, e.g. hr1 in congress/data/116/bills/hr/hr1
+BILL_TOPLEVEL_DIR_REGEX = r'[a-z]+[0-9]+'
+BILL_TOPLEVEL_DIR_REGEX_COMPILED = re.compile(BILL_TOPLEVEL_DIR_REGEX)
 
 # congress/data/117/bills/sconres/sconres2
 US_CONGRESS_PATH_REGEX_COMPILED = re.compile(
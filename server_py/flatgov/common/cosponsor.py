@@ -2,7 +2,7 @@ import requests
 import yaml
 
 from bills.models import Committee, Cosponsor, Bill
-from bills.views import deep_get
+from common.utils import deep_get
 
 try:
     from yaml import CLoader as Loader, CDumper as Dumper
@@ -21,6 +21,13 @@ class Command(BaseCommand):
     #                   help="increase output verbosity",
     #                   action="store_true")
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Resume from the checkpoint of an interrupted run; bills changed since are parsed again'
+        )
+
     def handle(self, *args, **options):
         # updateBillsList()
-        updateBillsMeta()
+        updateBillsMeta(resume=options['resume'])
@@ -4,7 +4,7 @@ import sys
 import re
 import logging
 
-from common.billdata import loadBillsMeta, saveBillsMeta
+from common.billdata import loadBillsMetaField, saveBillsMeta
 from common import constants
 
 logging.basicConfig(filename='process_bill_meta.log', filemode='w', level='INFO')
@@ -13,10 +13,10 @@ logger.addHandler(logging.StreamHandler(sys.stdout))
 
 
 def makeTitleIndex():
-    billsMeta = loadBillsMeta()
+    billsTitles = loadBillsMetaField('titles')
     titlesIndex = {}
-    for key, value in billsMeta.items():
-        titles = list(dict.fromkeys(value.get('titles')))
+    for key, titles in billsTitles.items():
+        titles = list(dict.fromkeys(titles))
         for title in titles:
             if titlesIndex.get(title):
                 titlesIndex[title].append(key)
@@ -26,10 +26,10 @@ def makeTitleIndex():
 
 
 def makeNoYearTitleIndex():
-    billsMeta = loadBillsMeta()
+    billsTitles = loadBillsMetaField('titles')
     noYearTitlesIndex = {}
-    for key, value in billsMeta.items():
-        titles = list(dict.fromkeys(value.get('titles')))
+    for key, titles in billsTitles.items():
+        titles = list(dict.fromkeys(titles))
         for title in titles:
             # truncate year from title
             noYearTitle = re.sub(r'of\s[0-9]{4}$', '', title)
@@ -4,11 +4,13 @@ import os
 import logging
 import re
 
+from django.utils import timezone
+
 from bills.handler import BillDataHandler
 from bills.models import Bill, Cosponsor
 from common.constants import PATH_TO_RELATEDBILLS_DIR, PATH_TO_NOYEAR_TITLES_INDEX
 from common.utils import loadTitlesIndex, loadRelatedBillJSON, dumpRelatedBillJSON
-from common.billdata import deep_get, billIdToBillNumber, loadDataJSON, loadBillsMeta
+from common.billdata import deep_get, billIdToBillNumber, loadDataJSON, loadBillsMetaField
 
 
 OF_YEAR_REGEX = re.compile(r'\sof\s[0-9]+$')
@@ -17,8 +19,8 @@ logging.basicConfig(filename='billdata.log', filemode='w', level='INFO')
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler(sys.stdout))
 
-BILLS_META = loadBillsMeta()
-ALL_BILLS = list(BILLS_META.keys())
+BILLS_TITLES = loadBillsMetaField('titles')
+ALL_BILLS = list(BILLS_TITLES.keys())
 
 
 # NOTE: This is very slow. Takes ~120 minutes for 111 - 116th Congress
@@ -32,7 +34,7 @@ def addSimilarTitles(noYearTitlesIndex: dict, billsRelated = {}):
             logger.info(str(titleNum) +' of ' + str(totalTitles))
             relatedBills = {bill: loadRelatedBillJSON(bill) for bill in bills}
             relatedTitles = {bill: list(filter(
-                lambda titleItem: titleItem.startswith(title), deep_get(BILLS_META, bill, 'titles'))
+                lambda titleItem: titleItem.startswith(title), BILLS_TITLES.get(bill))
             ) for bill in bills}
             for bill_outer in relatedBills:
                 for bill_inner in relatedBills:
@@ -161,7 +163,9 @@ def addSponsors():
                 defaults=bill_handler_obj.bill
             )
             if not created:
-                Bill.objects.filter(bill_congress_type_number=bill_outer).update(**bill_handler_obj.bill)
+                # QuerySet.update does not set auto_now fields; `updated` keys the bill page cache
+                Bill.objects.filter(bill_congress_type_number=bill_outer).update(
+                    **bill_handler_obj.bill, updated=timezone.now())
                 logger.info(f'{bill_obj.bill_congress_type_number} - bill has updated.')
             else:
                 logger.info(f'{bill_obj.bill_congress_type_number} - bill has created.')
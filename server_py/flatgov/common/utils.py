@@ -7,14 +7,88 @@ import os
 import re
 import sys
 
+from typing import Dict
 from pytz import timezone
 from common import constants
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from isal import igzip
+except ImportError:
+    igzip = gzip
+
 logging.basicConfig(filename='utils.log', filemode='w', level='INFO')
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler(sys.stdout))
 
 
+def loadsJSON(buf):
+    """
+    Decodes JSON, using orjson when it is installed and the stdlib json module otherwise
+
+    Args:
+        buf (bytes | str): JSON document; bytes must be UTF-8 encoded
+
+    Returns:
+        any: the decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+
+def dumpsJSON(obj) -> bytes:
+    """
+    Encodes an object as UTF-8 JSON bytes, using orjson when it is installed
+
+    Args:
+        obj (any): a JSON-serializable object
+
+    Returns:
+        bytes: the encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def loadGzipJSON(filePath: str):
+    """
+    Loads a gzipped JSON file. The file is decompressed to bytes (with python-isal when it is installed)
+    and decoded directly, without first decoding it to a str.
+
+    Args:
+        filePath (str): path to the .gz file
+
+    Returns:
+        any: the decoded object
+    """
+    with open(filePath, 'rb') as f:
+        return loadsJSON(igzip.decompress(f.read()))
+
+
+def deep_get(dictionary: Dict, *keys):
+    """
+    A Dict utility to get a field; returns None if the field does not exist
+
+    Args:
+        dictionary (Dict): an arbitrary dictionary
+
+    Returns:
+        any: value of the specified key, or None if the field does not exist
+    """
+    value = dictionary
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
 def getText(item) -> str:
     if item is None:
         return ''
@@ -85,8 +159,7 @@ def loadTitlesIndex(titleIndexPath=constants.PATH_TO_TITLES_INDEX, zip=True):
     titlesIndex = {}
     if zip:
         try:
-            with gzip.open(titleIndexPath + '.gz', 'rt', encoding='utf-8') as zipfile:
-                titlesIndex = json.load(zipfile)
+            titlesIndex = loadGzipJSON(titleIndexPath + '.gz')
         except:
             raise Exception('No file at' + titleIndexPath + '.gz')
     else:
@@ -119,8 +192,8 @@ def dumpRelatedBillJSON(
         billCongressTypeNumber, relatedBillJSON,
         relatedBillDirPath=constants.PATH_TO_RELATEDBILLS_DIR
 ):
-    if not os.path.isdir(relatedBillDirPath):
-        os.mkdir(relatedBillDirPath)
+    # exist_ok, since this may be called concurrently from worker processes
+    os.makedirs(relatedBillDirPath, exist_ok=True)
     relatedBillJSONPath = os.path.join(relatedBillDirPath, billCongressTypeNumber + '.json')
     if not relatedBillJSON:
         relatedBillJSON = {'related': {}}
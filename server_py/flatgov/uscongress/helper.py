@@ -5,7 +5,7 @@ from elasticsearch import Elasticsearch
 from common import constants
 from common.utils import dumpRelatedBillJSON
 from common.billdata import (
-    loadJSON,
+    loadBillDataJSON,
     billIdToBillNumber,
     getBillCongressTypeNumber,
     getBillTitles,
@@ -39,7 +39,7 @@ def validate_bill_dir(bill_dir, fname):
 
 def add_bill_meta(dirName: str, fileName: str):
     related_dict = dict()
-    billDict = loadJSON(os.path.join(dirName, fileName))
+    billDict = loadBillDataJSON(os.path.join(dirName, fileName))
     try:
         bill_congress_type_number = getBillCongressTypeNumber(billDict)
         if not bill_congress_type_number: